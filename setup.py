@@ -14,9 +14,12 @@ setup(
         "uvicorn[standard]>=0.27.0",
         "pandas>=2.1.4",
         "numpy>=1.26.3",
+        "pyarrow>=15.0.0",
         "scikit-learn>=1.3.2",
         "pydantic>=2.5.3",
         "pydantic-settings>=2.1.0",
+        "orjson>=3.9.10",
+        "cachetools>=5.3.2",
     ],
     python_requires=">=3.11",
     classifiers=[
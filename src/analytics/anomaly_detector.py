@@ -7,31 +7,150 @@ Detects abnormal behavior in battery telemetry using statistical methods.
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
+from joblib import parallel_backend
 from scipy import stats
+
+# Optional Intel acceleration; must be applied before sklearn estimators
+# are imported. Without sklearnex the stock implementation is used.
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn(verbose=False)
+except ImportError:
+    pass
+
 from sklearn.ensemble import IsolationForest
 
 
+def _attach_columns(df: pd.DataFrame, *blocks: pd.DataFrame) -> pd.DataFrame:
+    """
+    Concatenate result blocks onto a DataFrame in a single pass.
+
+    Columns of ``df`` that are redefined by a block are replaced.
+    """
+    new_cols = pd.Index([]).append([block.columns for block in blocks])
+    stale = df.columns.intersection(new_cols)
+    if len(stale):
+        df = df.drop(columns=stale)
+    return pd.concat([df, *blocks], axis=1, copy=False)
+
+
+def _zscores(arr: np.ndarray) -> np.ndarray:
+    """Absolute column-wise z-scores (sample std, NaNs ignored) of a 2-D array."""
+    valid = ~np.isnan(arr)
+    count = valid.sum(axis=0, keepdims=True)
+
+    # Columns with too few values get NaN statistics instead of warnings
+    mean = np.divide(
+        np.where(valid, arr, 0.0).sum(axis=0, keepdims=True), count,
+        out=np.full(count.shape, np.nan), where=count > 0
+    )
+    dev = np.where(valid, arr - mean, 0.0)
+    var = np.divide(
+        (dev * dev).sum(axis=0, keepdims=True), count - 1,
+        out=np.full(count.shape, np.nan), where=count > 1
+    )
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.abs((arr - mean) / np.sqrt(var))
+
+
+_ROLLING_BLOCK_SIZE = 1024
+
+
+def _block_mean_std(arr: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean/std for the ``len(arr) - window + 1`` full windows of one block."""
+    valid = ~np.isnan(arr)
+    count = valid.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Center on the block mean so the sum of squares keeps its precision
+        shift = np.nan_to_num(np.where(valid, arr, 0.0).sum(axis=0) / count)
+        x = np.where(valid, arr - shift, 0.0)
+
+        pad = np.zeros((1,) + arr.shape[1:])
+        csum = np.concatenate((pad, np.cumsum(x, axis=0)))
+        csum_sq = np.concatenate((pad, np.cumsum(x * x, axis=0)))
+        ccount = np.concatenate((pad, np.cumsum(valid, axis=0)))
+
+        win_sum = csum[window:] - csum[:-window]
+        win_sum_sq = csum_sq[window:] - csum_sq[:-window]
+        full = (ccount[window:] - ccount[:-window]) == window
+
+        mean = win_sum / window
+        var = np.maximum((win_sum_sq - win_sum * mean) / (window - 1), 0.0)
+
+        return np.where(full, mean + shift, np.nan), np.where(full, np.sqrt(var), np.nan)
+
+
+def _rolling_mean_std(
+    arr: np.ndarray,
+    window: int,
+    block_size: int = _ROLLING_BLOCK_SIZE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trailing rolling mean and sample std along axis 0 using cumulative sums.
+
+    Follows ``rolling(window).mean()`` / ``.std()`` semantics: the first
+    ``window - 1`` rows and any window containing a NaN are NaN. Sums are
+    accumulated per block of rows, each centered on its own mean, so
+    rounding error does not build up along drifting or monotone series.
+
+    Args:
+        arr: 1-D or 2-D float array (rows are time steps)
+        window: Rolling window size
+        block_size: Output rows computed per block
+
+    Returns:
+        Tuple of (rolling_mean, rolling_std) arrays shaped like ``arr``
+    """
+    rolling_mean = np.full(arr.shape, np.nan)
+    rolling_std = np.full(arr.shape, np.nan)
+
+    for start in range(window - 1, len(arr), block_size):
+        stop = min(start + block_size, len(arr))
+        mean, std = _block_mean_std(arr[start - window + 1:stop], window)
+        rolling_mean[start:stop] = mean
+        if window > 1:
+            rolling_std[start:stop] = std
+
+    return rolling_mean, rolling_std
+
+
 class BatteryAnomalyDetector:
     """
     Detects anomalies in battery operation data.
     """
 
-    def __init__(self, contamination: float = 0.05):
+    DEFAULT_THRESHOLDS = {
+        'voltage': (40.0, 60.0),
+        'current': (-200.0, 200.0),
+        'temperature': (0.0, 50.0)
+    }
+    SUDDEN_CHANGE_COLUMNS = ['temperature', 'voltage']
+    PATTERN_COLUMNS = ['voltage', 'current']
+
+    def __init__(self, contamination: float = 0.05, n_jobs: int = -1):
         """
         Initialize anomaly detector.
 
         Args:
             contamination: Expected proportion of outliers (0.0 to 0.5)
+            n_jobs: Parallel jobs for Isolation Forest (-1 uses all cores)
         """
         self.contamination = contamination
+        self.n_jobs = n_jobs
         self.isolation_forest = None
         self.statistical_bounds = {}
 
+    def reset(self) -> None:
+        """Discard the fitted model before analysing unrelated data."""
+        self.isolation_forest = None
+
     def detect_statistical_anomalies(
         self, 
         data: pd.DataFrame, 
         columns: Optional[List[str]] = None,
-        std_threshold: float = 3.0
+        std_threshold: float = 3.0,
+        copy: bool = True
     ) -> pd.DataFrame:
         """
         Detect anomalies using statistical methods (z-score).
@@ -40,27 +159,31 @@ class BatteryAnomalyDetector:
             data: Input data
             columns: Columns to check (default: all numeric)
             std_threshold: Number of standard deviations for threshold
+            copy: Copy data before modifying it (False if the caller owns it)
 
         Returns:
             DataFrame with anomaly flags
         """
-        df = data.copy()
+        df = data.copy() if copy else data
 
         if columns is None:
             columns = df.select_dtypes(include=[np.number]).columns.tolist()
 
-        # Calculate z-scores
-        for col in columns:
-            if col in df.columns:
-                mean = df[col].mean()
-                std = df[col].std()
-                z_scores = np.abs((df[col] - mean) / std)
-                df[f'{col}_anomaly'] = z_scores > std_threshold
-                df[f'{col}_zscore'] = z_scores
+        columns = [col for col in columns if col in df.columns]
+
+        # Calculate z-scores for all columns in one vectorized pass
+        z_scores = _zscores(df[columns].to_numpy(dtype=np.float64, copy=False))
+        flags = z_scores > std_threshold
 
-        # Overall anomaly flag
-        anomaly_cols = [f'{col}_anomaly' for col in columns if f'{col}_anomaly' in df.columns]
-        df['is_anomaly'] = df[anomaly_cols].any(axis=1)
+        anomaly_cols = [f'{col}_anomaly' for col in columns]
+
+        df = _attach_columns(
+            df,
+            pd.DataFrame(flags, index=df.index, columns=anomaly_cols),
+            pd.DataFrame(z_scores, index=df.index, columns=[f'{col}_zscore' for col in columns]),
+            # Overall anomaly flag
+            pd.DataFrame({'is_anomaly': flags.any(axis=1)}, index=df.index)
+        )
 
         return df
 
@@ -72,6 +195,9 @@ class BatteryAnomalyDetector:
         """
         Detect anomalies using Isolation Forest algorithm.
 
+        The fitted forest is kept on the instance and reused by later calls
+        with the same number of features.
+
         Args:
             data: Input data
             features: Feature columns to use
@@ -82,23 +208,45 @@ class BatteryAnomalyDetector:
         if features is None:
             features = data.select_dtypes(include=[np.number]).columns.tolist()
 
-        X = data[features].fillna(data[features].mean())
-
-        if self.isolation_forest is None:
-            self.isolation_forest = IsolationForest(
-                contamination=self.contamination,
-                random_state=42
-            )
-            self.isolation_forest.fit(X)
-
-        predictions = self.isolation_forest.predict(X)
+        # sklearn trees work on C-ordered float32; hand it exactly that so
+        # fit/predict do not re-copy the (typically F-ordered) block.
+        # Telemetry never needs more than float32's ~1e-7 relative precision.
+        X = np.ascontiguousarray(data[features].to_numpy(dtype=np.float32, na_value=np.nan))
+
+        # Impute gaps with column means directly on the float32 matrix
+        missing = np.isnan(X)
+        if missing.any():
+            X[missing] = np.take(np.nanmean(X, axis=0), np.nonzero(missing)[1])
+
+        # Threading backend: the tree code releases the GIL, and it avoids
+        # pickling X to worker processes
+        with parallel_backend('threading', n_jobs=self.n_jobs):
+            # Reuse the fitted forest unless the feature space changed
+            if (
+                self.isolation_forest is None
+                or self.isolation_forest.n_features_in_ != X.shape[1]
+            ):
+                # Subsample 256 rows per tree: bounds fit cost regardless of
+                # dataset size, and isolation works best on small samples
+                self.isolation_forest = IsolationForest(
+                    n_estimators=100,
+                    max_samples=min(256, len(X)),
+                    contamination=self.contamination,
+                    max_features=1.0,
+                    n_jobs=self.n_jobs,
+                    random_state=42
+                )
+                self.isolation_forest.fit(X)
+
+            predictions = self.isolation_forest.predict(X)
 
         return predictions
 
     def detect_threshold_violations(
         self, 
         data: pd.DataFrame,
-        thresholds: Dict[str, Tuple[float, float]]
+        thresholds: Dict[str, Tuple[float, float]],
+        copy: bool = True
     ) -> pd.DataFrame:
         """
         Detect violations of predefined operational thresholds.
@@ -106,11 +254,12 @@ class BatteryAnomalyDetector:
         Args:
             data: Input data
             thresholds: Dict mapping column names to (min, max) tuples
+            copy: Copy data before modifying it (False if the caller owns it)
 
         Returns:
             DataFrame with violation flags
         """
-        df = data.copy()
+        df = data.copy() if copy else data
 
         for col, (min_val, max_val) in thresholds.items():
             if col in df.columns:
@@ -118,7 +267,10 @@ class BatteryAnomalyDetector:
                 df[f'{col}_violation'] = violations
 
         # Overall violation flag
-        violation_cols = [col for col in df.columns if col.endswith('_violation')]
+        violation_cols = [
+            col for col in df.columns
+            if col.endswith('_violation') and col != 'has_violation'
+        ]
         df['has_violation'] = df[violation_cols].any(axis=1)
 
         return df
@@ -127,7 +279,9 @@ class BatteryAnomalyDetector:
         self, 
         data: pd.DataFrame,
         column: str,
-        change_threshold: float = 10.0
+        change_threshold: float = 10.0,
+        copy: bool = True,
+        keep_delta: bool = False
     ) -> pd.DataFrame:
         """
         Detect sudden changes in a metric (e.g., temperature spike).
@@ -136,18 +290,30 @@ class BatteryAnomalyDetector:
             data: Input data with timestamp
             column: Column to monitor
             change_threshold: Threshold for change detection
+            copy: Copy data before modifying it (False if the caller owns it)
+            keep_delta: Also store the step-to-step change as '<column>_delta'
 
         Returns:
             DataFrame with change detection flags
         """
-        df = data.copy()
+        df = data.copy() if copy else data
 
         if column not in df.columns:
             raise ValueError(f"Column '{column}' not found in data")
 
         # Calculate rate of change
-        df[f'{column}_delta'] = df[column].diff()
-        df[f'{column}_sudden_change'] = np.abs(df[f'{column}_delta']) > change_threshold
+        arr = df[column].to_numpy(dtype=np.float64)
+        delta = np.empty_like(arr)
+        delta[:1] = np.nan
+        np.subtract(arr[1:], arr[:-1], out=delta[1:])
+
+        if keep_delta:
+            df[f'{column}_delta'] = delta
+            delta = np.abs(delta)
+        else:
+            np.abs(delta, out=delta)
+        with np.errstate(invalid='ignore'):
+            df[f'{column}_sudden_change'] = delta > change_threshold
 
         return df
 
@@ -155,7 +321,8 @@ class BatteryAnomalyDetector:
         self, 
         data: pd.DataFrame,
         column: str,
-        window: int = 20
+        window: int = 20,
+        copy: bool = True
     ) -> pd.DataFrame:
         """
         Detect deviations from expected patterns using rolling statistics.
@@ -164,29 +331,106 @@ class BatteryAnomalyDetector:
             data: Input data
             column: Column to analyze
             window: Rolling window size
+            copy: Copy data before modifying it (False if the caller owns it)
 
         Returns:
             DataFrame with pattern deviation flags
         """
-        df = data.copy()
+        df = data.copy() if copy else data
 
         if column not in df.columns:
             raise ValueError(f"Column '{column}' not found in data")
 
         # Rolling statistics
-        df[f'{column}_rolling_mean'] = df[column].rolling(window=window).mean()
-        df[f'{column}_rolling_std'] = df[column].rolling(window=window).std()
+        arr = df[column].to_numpy(np.float64)
+        rolling_mean, rolling_std = _rolling_mean_std(arr, window)
+        df[f'{column}_rolling_mean'] = rolling_mean
+        df[f'{column}_rolling_std'] = rolling_std
 
         # Deviation from rolling mean
-        deviation = np.abs(df[column] - df[f'{column}_rolling_mean'])
-        df[f'{column}_pattern_deviation'] = deviation > (3 * df[f'{column}_rolling_std'])
+        deviation = np.abs(arr - rolling_mean)
+        df[f'{column}_pattern_deviation'] = deviation > (3 * rolling_std)
 
         return df
 
+    def _fused_anomaly_kernel(
+        self,
+        arr: np.ndarray,
+        columns: List[str],
+        thresholds: Dict[str, Tuple[float, float]],
+        std_threshold: float = 3.0,
+        change_threshold: float = 10.0,
+        window: int = 20
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute all rule-based anomaly indicators from one telemetry block.
+
+        Produces the same columns as the individual detect_* methods, but
+        from a single (N, K) array instead of one DataFrame pass per check.
+
+        Args:
+            arr: Float array of shape (N, K), one column per entry in columns
+            columns: Column names of arr
+            thresholds: Dict mapping column names to (min, max) tuples
+            std_threshold: Number of standard deviations for z-score flags
+            change_threshold: Threshold for sudden change detection
+            window: Rolling window size for pattern deviations
+
+        Returns:
+            Dict mapping result column names to 1-D arrays
+        """
+        col_idx = {col: j for j, col in enumerate(columns)}
+        results: Dict[str, np.ndarray] = {}
+
+        # Statistical anomalies
+        z_scores = _zscores(arr)
+        flags = z_scores > std_threshold
+        for j, col in enumerate(columns):
+            results[f'{col}_anomaly'] = flags[:, j]
+        for j, col in enumerate(columns):
+            results[f'{col}_zscore'] = z_scores[:, j]
+        results['is_anomaly'] = flags.any(axis=1)
+
+        # Threshold violations
+        limited = [col for col in thresholds if col in col_idx]
+        block = arr[:, [col_idx[col] for col in limited]]
+        lower = np.array([thresholds[col][0] for col in limited], dtype=np.float64)
+        upper = np.array([thresholds[col][1] for col in limited], dtype=np.float64)
+        violations = (block < lower) | (block > upper)
+        for k, col in enumerate(limited):
+            results[f'{col}_violation'] = violations[:, k]
+        results['has_violation'] = violations.any(axis=1)
+
+        # Sudden changes
+        changing = [col for col in self.SUDDEN_CHANGE_COLUMNS if col in col_idx]
+        block = arr[:, [col_idx[col] for col in changing]]
+        delta = np.empty_like(block)
+        delta[:1] = np.nan
+        np.subtract(block[1:], block[:-1], out=delta[1:])
+        np.abs(delta, out=delta)
+        with np.errstate(invalid='ignore'):
+            sudden = delta > change_threshold
+        for k, col in enumerate(changing):
+            results[f'{col}_sudden_change'] = sudden[:, k]
+
+        # Pattern deviations
+        patterned = [col for col in self.PATTERN_COLUMNS if col in col_idx]
+        block = arr[:, [col_idx[col] for col in patterned]]
+        rolling_mean, rolling_std = _rolling_mean_std(block, window)
+        with np.errstate(invalid='ignore'):
+            deviations = np.abs(block - rolling_mean) > 3 * rolling_std
+        for k, col in enumerate(patterned):
+            results[f'{col}_rolling_mean'] = rolling_mean[:, k]
+            results[f'{col}_rolling_std'] = rolling_std[:, k]
+            results[f'{col}_pattern_deviation'] = deviations[:, k]
+
+        return results
+
     def comprehensive_anomaly_detection(
         self, 
         data: pd.DataFrame,
-        operational_thresholds: Optional[Dict[str, Tuple[float, float]]] = None
+        operational_thresholds: Optional[Dict[str, Tuple[float, float]]] = None,
+        copy: bool = True
     ) -> pd.DataFrame:
         """
         Run comprehensive anomaly detection pipeline.
@@ -194,56 +438,57 @@ class BatteryAnomalyDetector:
         Args:
             data: Input battery telemetry data
             operational_thresholds: Optional thresholds for specific metrics
+            copy: Copy data before modifying it (False if the caller owns it)
 
         Returns:
             DataFrame with all anomaly detection results
         """
-        df = data.copy()
-
-        # Statistical anomalies
-        df = self.detect_statistical_anomalies(df)
-
-        # Isolation Forest
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        if numeric_cols:
-            df['isolation_forest_anomaly'] = self.detect_isolation_forest(df, numeric_cols)
-            df['isolation_forest_anomaly'] = df['isolation_forest_anomaly'] == -1
+        df = data.copy() if copy else data
 
-        # Threshold violations
         if operational_thresholds is None:
-            operational_thresholds = {
-                'voltage': (40.0, 60.0),
-                'current': (-200.0, 200.0),
-                'temperature': (0.0, 50.0)
-            }
-        df = self.detect_threshold_violations(df, operational_thresholds)
+            operational_thresholds = self.DEFAULT_THRESHOLDS
 
-        # Sudden changes
-        for col in ['temperature', 'voltage']:
-            if col in df.columns:
-                df = self.detect_sudden_changes(df, col)
+        # Read the raw telemetry once; every detector works off this block
+        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        arr = df[numeric_cols].to_numpy(dtype=np.float64, copy=False)
+        results = self._fused_anomaly_kernel(arr, numeric_cols, operational_thresholds)
 
-        # Pattern deviations
-        for col in ['voltage', 'current']:
-            if col in df.columns:
-                df = self.detect_pattern_deviations(df, col)
+        # Isolation Forest
+        if numeric_cols:
+            results['isolation_forest_anomaly'] = self.detect_isolation_forest(df, numeric_cols) == -1
+
+        # Gather boolean indicators into one (N, K) block. Fortran order
+        # matches pandas' column-major block layout, so it is wrapped as-is
+        anomaly_indicators = [name for name, values in results.items() if values.dtype == bool]
+        flag_mat = np.empty((len(df), len(anomaly_indicators)), dtype=bool, order='F')
+        for k, name in enumerate(anomaly_indicators):
+            flag_mat[:, k] = results.pop(name)
+
+        blocks = [
+            pd.DataFrame(flag_mat, index=df.index, columns=anomaly_indicators, copy=False),
+            pd.DataFrame(results, index=df.index)
+        ]
 
         # Composite anomaly score
-        anomaly_indicators = [
-            col for col in df.columns 
-            if 'anomaly' in col or 'violation' in col or 'deviation' in col or 'change' in col
-        ]
         if anomaly_indicators:
-            df['anomaly_score'] = df[anomaly_indicators].sum(axis=1) / len(anomaly_indicators)
+            score = flag_mat.sum(axis=1, dtype=np.int32) / len(anomaly_indicators)
+            blocks.append(pd.DataFrame({'anomaly_score': score}, index=df.index))
+
+        df = _attach_columns(df, *blocks)
 
         return df
 
-    def get_anomaly_summary(self, data: pd.DataFrame) -> Dict:
+    def get_anomaly_summary(
+        self,
+        data: pd.DataFrame,
+        mask: Optional[np.ndarray] = None
+    ) -> Dict:
         """
         Generate summary of detected anomalies.
 
         Args:
             data: Data with anomaly detection results
+            mask: Precomputed is_anomaly array (optional)
 
         Returns:
             Dictionary with anomaly statistics
@@ -255,14 +500,20 @@ class BatteryAnomalyDetector:
             'anomaly_types': {}
         }
 
-        if 'is_anomaly' in data.columns:
-            summary['anomaly_count'] = data['is_anomaly'].sum()
-            summary['anomaly_percentage'] = (summary['anomaly_count'] / len(data)) * 100
-
-        # Count anomalies by type
-        anomaly_cols = [col for col in data.columns if 'anomaly' in col or 'violation' in col]
+        if mask is None and 'is_anomaly' in data.columns:
+            mask = data['is_anomaly'].to_numpy()
+        if mask is not None and mask.size:
+            summary['anomaly_count'] = int(np.count_nonzero(mask))
+            summary['anomaly_percentage'] = 100.0 * summary['anomaly_count'] / mask.size
+
+        # Count anomalies by type, taken from the frame itself so the summary
+        # does not depend on what this instance ran before (anomaly_score is
+        # a score, not a flag)
+        anomaly_cols = [
+            col for col in data.columns
+            if ('anomaly' in col or 'violation' in col) and col != 'anomaly_score'
+        ]
         for col in anomaly_cols:
-            if col in data.columns:
-                summary['anomaly_types'][col] = int(data[col].sum())
+            summary['anomaly_types'][col] = int(data[col].sum())
 
         return summary
@@ -13,6 +13,98 @@ import pandas as pd
 from typing import Dict, Optional, Tuple
 from datetime import datetime
 
+try:
+    from numba import njit
+except ImportError:  # numba is an optional accelerator
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _turning_points(soc: np.ndarray, hysteresis: float) -> np.ndarray:
+    """
+    Extract SOC turning points, ignoring reversals smaller than a threshold.
+
+    Args:
+        soc: Contiguous float64 array of SOC values (%) without NaNs
+        hysteresis: Minimum reversal depth (%) that starts a new segment
+
+    Returns:
+        Array of turning points, starting with the first sample
+    """
+    points = np.empty(len(soc), dtype=np.float64)
+    if len(soc) == 0:
+        return points
+
+    points[0] = soc[0]
+    m = 1
+    extreme = soc[0]
+    direction = 0
+
+    for i in range(1, len(soc)):
+        x = soc[i]
+        if direction == 0:
+            # Wait for the first move large enough to set a direction
+            if x != points[0] and abs(x - points[0]) >= hysteresis:
+                direction = 1 if x > points[0] else -1
+                extreme = x
+        elif (x - extreme) * direction > 0:
+            extreme = x
+        elif x != extreme and abs(x - extreme) >= hysteresis:
+            points[m] = extreme
+            m += 1
+            direction = -direction
+            extreme = x
+
+    if direction != 0:
+        points[m] = extreme
+        m += 1
+
+    return points[:m]
+
+
+@njit(cache=True)
+def _rainflow_count(points: np.ndarray) -> Tuple[int, int]:
+    """
+    Rainflow-count a series of turning points using Downing's four-point rule.
+
+    Args:
+        points: Turning points as returned by ``_turning_points``
+
+    Returns:
+        Tuple of (closed cycles, residual half cycles)
+    """
+    stack = np.empty(len(points), dtype=np.float64)
+    n = 0
+    closed = 0
+
+    for i in range(len(points)):
+        stack[n] = points[i]
+        n += 1
+
+        # An inner range enclosed by both neighbours is a full cycle
+        while n >= 4:
+            inner = abs(stack[n - 2] - stack[n - 3])
+            if inner <= abs(stack[n - 3] - stack[n - 4]) and inner <= abs(stack[n - 1] - stack[n - 2]):
+                closed += 1
+                stack[n - 3] = stack[n - 1]
+                n -= 2
+            else:
+                break
+
+    # Whatever is left on the stack counts as half cycles
+    return closed, max(n - 1, 0)
+
+
+# Default reversal depth (% SOC) below which SOC movement is treated as noise
+MIN_CYCLE_DEPTH = 5.0
+
+# Trigger compilation at import so the first request does not pay for it
+_rainflow_count(_turning_points(np.array([0.0, 100.0, 0.0, 100.0]), MIN_CYCLE_DEPTH))
+
 
 class BatteryMetricsCalculator:
     """
@@ -40,8 +132,20 @@ class BatteryMetricsCalculator:
         Returns:
             SOH as percentage (0-100)
         """
-        soh = (current_capacity / self.nominal_capacity) * 100
-        return max(0.0, min(100.0, soh))
+        return float(self.calculate_soh_array(current_capacity))
+
+    def calculate_soh_array(self, capacity: np.ndarray) -> np.ndarray:
+        """
+        Calculate SOH for a whole capacity history.
+
+        Args:
+            capacity: Measured capacities in kWh
+
+        Returns:
+            Array of SOH percentages (0-100)
+        """
+        soh = (np.asarray(capacity, dtype=np.float64) / self.nominal_capacity) * 100
+        return np.clip(soh, 0.0, 100.0)
 
     def calculate_soc(self, current_charge: float, max_capacity: float) -> float:
         """
@@ -54,8 +158,26 @@ class BatteryMetricsCalculator:
         Returns:
             SOC as percentage (0-100)
         """
-        soc = (current_charge / max_capacity) * 100
-        return max(0.0, min(100.0, soc))
+        return float(self.calculate_soc_array(current_charge, max_capacity))
+
+    def calculate_soc_array(
+        self, 
+        current_charge: np.ndarray, 
+        max_capacity: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate SOC for arrays of charge levels.
+
+        Args:
+            current_charge: Charge levels in kWh
+            max_capacity: Maximum capacities in kWh (scalar or same shape)
+
+        Returns:
+            Array of SOC percentages (0-100)
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            soc = (np.asarray(current_charge, dtype=np.float64) / max_capacity) * 100
+        return np.clip(soc, 0.0, 100.0)
 
     def calculate_degradation_rate(
         self, 
@@ -86,34 +208,66 @@ class BatteryMetricsCalculator:
 
         return max(0.0, degradation_rate)
 
-    def count_cycles(self, charge_data: pd.DataFrame) -> Tuple[int, float]:
+    def count_cycles(
+        self,
+        charge_data: pd.DataFrame,
+        min_depth: float = MIN_CYCLE_DEPTH
+    ) -> Tuple[int, float]:
         """
-        Count charge/discharge cycles using rainflow counting algorithm.
+        Count equivalent full charge/discharge cycles.
+
+        SOC swings contribute by their depth (a 0-100-0 swing is one full
+        cycle), which equals depth-weighted rainflow counting. Reversals
+        shallower than ``min_depth`` are filtered out first so sensor noise
+        does not accumulate into phantom cycles.
 
         Args:
             charge_data: DataFrame with SOC values over time
+            min_depth: Ignore SOC reversals shallower than this depth (%)
 
         Returns:
-            Tuple of (full_cycles, partial_cycles)
+            Tuple of (full_cycles, partial_cycles), where partial_cycles is the
+            fractional remainder of equivalent full cycles
         """
         if 'soc' not in charge_data.columns:
             return 0, 0.0
 
-        soc_values = charge_data['soc'].values
+        points = self._soc_turning_points(charge_data, min_depth)
 
-        # Simple cycle counting (full cycle = 0-100-0)
-        full_cycles = 0
-        partial_cycle_sum = 0.0
+        # Full cycle = 0-100-0, i.e. 200 % of accumulated SOC change
+        total_cycles = float(np.abs(np.diff(points)).sum()) / 200.0
+        full_cycles = int(total_cycles)
+        partial_cycles = total_cycles - full_cycles
 
-        # Track SOC changes
-        for i in range(1, len(soc_values)):
-            delta_soc = abs(soc_values[i] - soc_values[i-1])
-            partial_cycle_sum += delta_soc / 100.0
+        return full_cycles, partial_cycles
 
-        full_cycles = int(partial_cycle_sum // 2)
-        partial_cycles = partial_cycle_sum % 2
+    def count_rainflow_cycles(
+        self,
+        charge_data: pd.DataFrame,
+        min_depth: float = MIN_CYCLE_DEPTH
+    ) -> Tuple[int, int]:
+        """
+        Count raw rainflow cycles, one per closed cycle regardless of depth.
 
-        return full_cycles, partial_cycles
+        Args:
+            charge_data: DataFrame with SOC values over time
+            min_depth: Ignore SOC reversals shallower than this depth (%)
+
+        Returns:
+            Tuple of (closed_cycles, half_cycles)
+        """
+        if 'soc' not in charge_data.columns:
+            return 0, 0
+
+        closed, halves = _rainflow_count(self._soc_turning_points(charge_data, min_depth))
+        return int(closed), int(halves)
+
+    @staticmethod
+    def _soc_turning_points(charge_data: pd.DataFrame, min_depth: float) -> np.ndarray:
+        """Noise-filtered SOC turning points (NaNs dropped)."""
+        soc_values = charge_data['soc'].to_numpy(np.float64)
+        soc_values = np.ascontiguousarray(soc_values[~np.isnan(soc_values)])
+        return _turning_points(soc_values, float(min_depth))
 
     def calculate_energy_efficiency(
         self, 
@@ -147,18 +301,32 @@ class BatteryMetricsCalculator:
         Returns:
             Health status: 'excellent', 'good', 'fair', 'poor', 'critical'
         """
-        temp_normal = 15 <= temperature <= 35
+        return str(self.assess_health_status_array(soh, temperature))
+
+    def assess_health_status_array(
+        self, 
+        soh: np.ndarray, 
+        temperature: np.ndarray
+    ) -> np.ndarray:
+        """
+        Assess health status for arrays of SOH and temperature readings.
+
+        Args:
+            soh: State of Health percentages
+            temperature: Temperatures in Celsius
+
+        Returns:
+            Array of health status strings
+        """
+        soh = np.asarray(soh, dtype=np.float64)
+        temperature = np.asarray(temperature, dtype=np.float64)
+        temp_normal = (temperature >= 15) & (temperature <= 35)
 
-        if soh >= 95 and temp_normal:
-            return "excellent"
-        elif soh >= 85 and temp_normal:
-            return "good"
-        elif soh >= 70:
-            return "fair"
-        elif soh >= 50:
-            return "poor"
-        else:
-            return "critical"
+        return np.select(
+            [(soh >= 95) & temp_normal, (soh >= 85) & temp_normal, soh >= 70, soh >= 50],
+            ["excellent", "good", "fair", "poor"],
+            default="critical"
+        )
 
     def calculate_comprehensive_metrics(
         self, 
@@ -171,7 +339,7 @@ class BatteryMetricsCalculator:
             battery_data: DataFrame with columns: voltage, current, temperature, capacity, soc
 
         Returns:
-            Dictionary of calculated metrics
+            Dictionary of calculated metrics (native Python scalars)
         """
         metrics = {}
 
@@ -183,21 +351,21 @@ class BatteryMetricsCalculator:
             )
 
         if 'soc' in battery_data.columns:
-            metrics['current_soc'] = battery_data['soc'].iloc[-1]
-            full_cycles, partial = self.count_cycles(battery_data)
+            metrics['current_soc'] = float(battery_data['soc'].iloc[-1])
+            full_cycles, partial = self.count_cycles(battery_data, min_depth=MIN_CYCLE_DEPTH)
             metrics['full_cycles'] = full_cycles
             metrics['partial_cycles'] = partial
 
         if 'voltage' in battery_data.columns:
-            metrics['avg_voltage'] = battery_data['voltage'].mean()
-            metrics['voltage_std'] = battery_data['voltage'].std()
+            metrics['avg_voltage'] = float(battery_data['voltage'].mean())
+            metrics['voltage_std'] = float(battery_data['voltage'].std())
 
         if 'temperature' in battery_data.columns:
-            metrics['avg_temperature'] = battery_data['temperature'].mean()
-            metrics['max_temperature'] = battery_data['temperature'].max()
+            metrics['avg_temperature'] = float(battery_data['temperature'].mean())
+            metrics['max_temperature'] = float(battery_data['temperature'].max())
 
         if 'current' in battery_data.columns:
-            metrics['avg_current'] = battery_data['current'].mean()
+            metrics['avg_current'] = float(battery_data['current'].mean())
 
         # Health status
         if 'soh' in metrics and 'avg_temperature' in metrics:
@@ -9,6 +9,8 @@ import numpy as np
 from typing import Dict, List, Optional, Union
 from datetime import datetime, timedelta
 
+from src.data.data_loader import load_battery_data
+
 
 class BatteryDataProcessor:
     """
@@ -31,13 +33,16 @@ class BatteryDataProcessor:
         Returns:
             Loaded DataFrame
         """
-        if isinstance(data, str):
-            self.data = pd.read_csv(data, parse_dates=['timestamp'])
-        else:
-            self.data = data.copy()
-
+        self.data = self._read(data)
         return self.data
 
+    @staticmethod
+    def _read(data: Union[pd.DataFrame, str]) -> pd.DataFrame:
+        """Read a CSV path or copy a DataFrame into a frame the caller owns."""
+        if isinstance(data, str):
+            return load_battery_data(data)
+        return data.copy()
+
     def validate_data(self, data: pd.DataFrame) -> Dict[str, bool]:
         """
         Validate battery data for completeness and correctness.
@@ -63,11 +68,20 @@ class BatteryDataProcessor:
         if 'timestamp' in data.columns:
             validation_results['has_valid_timestamps'] = pd.api.types.is_datetime64_any_dtype(data['timestamp'])
 
-        # Check for duplicates
-        validation_results['has_duplicates'] = data.duplicated().any()
+        # Check for duplicates (timestamp is the record key, as in clean_data)
+        if 'timestamp' in data.columns:
+            validation_results['has_duplicates'] = bool(data['timestamp'].duplicated().any())
+        else:
+            validation_results['has_duplicates'] = bool(data.duplicated().any())
 
-        # Check for missing values
-        validation_results['has_missing_values'] = data.isnull().any().any()
+        # Check for missing values: one ndarray reduction over the numeric
+        # block, pandas isna only for the remaining columns
+        numeric = data.select_dtypes(include=[np.number])
+        other_cols = data.columns.difference(numeric.columns)
+        validation_results['has_missing_values'] = bool(
+            np.isnan(numeric.to_numpy(dtype=np.float64, na_value=np.nan)).any()
+            or data[other_cols].isna().to_numpy().any()
+        )
 
         # Check value ranges
         if 'voltage' in data.columns:
@@ -79,17 +93,22 @@ class BatteryDataProcessor:
 
         return validation_results
 
-    def clean_data(self, data: pd.DataFrame) -> pd.DataFrame:
+    def clean_data(
+        self,
+        data: pd.DataFrame,
+        copy: bool = True
+    ) -> pd.DataFrame:
         """
         Clean battery data by handling missing values and outliers.
 
         Args:
             data: DataFrame to clean
+            copy: Copy data before modifying it (False if the caller owns it)
 
         Returns:
             Cleaned DataFrame
         """
-        df = data.copy()
+        df = data.copy() if copy else data
 
         # Remove duplicates
         df = df.drop_duplicates(subset=['timestamp'], keep='first')
@@ -100,24 +119,26 @@ class BatteryDataProcessor:
 
         # Handle missing values with forward fill
         numeric_cols = df.select_dtypes(include=[np.number]).columns
-        df[numeric_cols] = df[numeric_cols].fillna(method='ffill').fillna(method='bfill')
+        numeric = df[numeric_cols]
+        if numeric.isna().to_numpy().any():
+            df[numeric_cols] = numeric.ffill().bfill()
 
         # Remove outliers using IQR method
-        for col in ['voltage', 'current', 'temperature']:
-            if col in df.columns:
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 3 * IQR
-                upper_bound = Q3 + 3 * IQR
-                df[col] = df[col].clip(lower_bound, upper_bound)
+        cols = [col for col in ('voltage', 'current', 'temperature') if col in df.columns]
+        if cols:
+            arr = df[cols].to_numpy(np.float64, copy=True)
+            Q1, Q3 = np.nanquantile(arr, [0.25, 0.75], axis=0)
+            IQR = Q3 - Q1
+            np.clip(arr, Q1 - 3 * IQR, Q3 + 3 * IQR, out=arr)
+            df[cols] = arr
 
         return df
 
     def resample_data(
         self, 
         data: pd.DataFrame, 
-        frequency: str = '1min'
+        frequency: str = '1min',
+        copy: bool = True
     ) -> pd.DataFrame:
         """
         Resample time-series data to specified frequency.
@@ -125,50 +146,111 @@ class BatteryDataProcessor:
         Args:
             data: DataFrame with timestamp index
             frequency: Resampling frequency (e.g., '1min', '5min', '1H')
+            copy: Copy data before modifying it (False if the caller owns it)
 
         Returns:
             Resampled DataFrame
         """
-        df = data.copy()
+        df = data.copy() if copy else data
 
         if 'timestamp' not in df.columns:
             raise ValueError("Data must have 'timestamp' column")
 
-        df = df.set_index('timestamp')
-
-        # Resample numeric columns
         numeric_cols = df.select_dtypes(include=[np.number]).columns
-        resampled = df[numeric_cols].resample(frequency).mean()
+        offset = pd.tseries.frequencies.to_offset(frequency)
+        timestamps = df['timestamp']
+
+        # Calendar frequencies, tz-aware or missing timestamps: let pandas
+        # place the bins
+        if (
+            not isinstance(offset, pd.offsets.Tick)
+            or len(df) == 0
+            or not pd.api.types.is_datetime64_dtype(timestamps)
+            or timestamps.isna().any()
+        ):
+            df = df.set_index('timestamp')
+            resampled = df[numeric_cols].resample(frequency).mean()
+            return resampled.reset_index()
+
+        ts_ns = timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        values = df[numeric_cols].to_numpy(dtype=np.float64)
+        if not timestamps.is_monotonic_increasing:
+            order = np.argsort(ts_ns, kind='stable')
+            ts_ns = ts_ns[order]
+            values = values[order]
+
+        # Fixed-width bins anchored at midnight of the first day, matching
+        # resample's default origin='start_day'
+        freq_ns = offset.nanos
+        day_ns = pd.Timedelta(days=1).value
+        origin = ts_ns[0] // day_ns * day_ns
+        bin_id = (ts_ns - origin) // freq_ns
+        edges = np.flatnonzero(np.diff(bin_id, prepend=bin_id[0] - 1))
+
+        # Per-bin NaN-skipping means in one reduceat pass per statistic
+        valid = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(valid, values, 0.0), edges, axis=0)
+        counts = np.add.reduceat(valid, edges, axis=0, dtype=np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / counts
+
+        # Empty bins in between are kept as NaN rows, as resample does
+        n_bins = bin_id[-1] - bin_id[0] + 1
+        out = np.full((n_bins, len(numeric_cols)), np.nan)
+        out[bin_id[edges] - bin_id[0]] = means
+        bin_starts = origin + (bin_id[0] + np.arange(n_bins)) * freq_ns
+
+        resampled = pd.DataFrame(
+            out,
+            index=pd.DatetimeIndex(bin_starts.view('datetime64[ns]'), name='timestamp'),
+            columns=numeric_cols,
+            copy=False
+        )
 
         return resampled.reset_index()
 
-    def calculate_derived_features(self, data: pd.DataFrame) -> pd.DataFrame:
+    def calculate_derived_features(
+        self,
+        data: pd.DataFrame,
+        copy: bool = True
+    ) -> pd.DataFrame:
         """
         Calculate derived features from raw telemetry.
 
         Args:
             data: Raw battery data
+            copy: Copy data before modifying it (False if the caller owns it)
 
         Returns:
             DataFrame with additional features
         """
-        df = data.copy()
+        df = data.copy() if copy else data
 
         # Calculate power if not present
         if 'power' not in df.columns and 'voltage' in df.columns and 'current' in df.columns:
             df['power'] = df['voltage'] * df['current']
 
-        # Calculate energy (kWh) from power over time
         if 'power' in df.columns and 'timestamp' in df.columns:
             df = df.sort_values('timestamp')
-            time_diff = df['timestamp'].diff().dt.total_seconds() / 3600  # hours
-            df['energy_delta'] = df['power'] * time_diff / 1000  # kWh
+
+        # Sampling interval in seconds, shared by the time-based features
+        dt_sec = None
+        if 'timestamp' in df.columns:
+            dt_sec = df['timestamp'].diff().dt.total_seconds().to_numpy()
+
+        # Calculate energy (kWh) from power over time
+        if 'power' in df.columns and dt_sec is not None:
+            df['energy_delta'] = df['power'].to_numpy() * dt_sec / 3600 / 1000  # kWh
             df['cumulative_energy'] = df['energy_delta'].cumsum()
 
         # Temperature rate of change
         if 'temperature' in df.columns:
             df['temp_delta'] = df['temperature'].diff()
-            df['temp_rate'] = df['temp_delta'] / df['timestamp'].diff().dt.total_seconds()
+            if dt_sec is not None:
+                # Repeated timestamps would divide by zero; report no change
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    temp_rate = df['temp_delta'].to_numpy() / dt_sec
+                df['temp_rate'] = np.where(dt_sec == 0, 0.0, temp_rate)
 
         # Voltage variance over rolling window
         if 'voltage' in df.columns:
@@ -235,8 +317,9 @@ class BatteryDataProcessor:
         Returns:
             Processed DataFrame
         """
-        # Load data
-        df = self.load_data(data)
+        # Load data into a frame the pipeline owns; not kept on self.data,
+        # so a shared processor does not pin the last input in memory
+        df = self._read(data)
 
         # Validate
         validation = self.validate_data(df)
@@ -245,14 +328,14 @@ class BatteryDataProcessor:
 
         # Clean
         if clean:
-            df = self.clean_data(df)
+            df = self.clean_data(df, copy=False)
 
         # Add derived features
         if add_features:
-            df = self.calculate_derived_features(df)
+            df = self.calculate_derived_features(df, copy=False)
 
         # Resample if requested
         if resample_freq:
-            df = self.resample_data(df, resample_freq)
+            df = self.resample_data(df, resample_freq, copy=False)
 
         return df
@@ -4,12 +4,13 @@ FastAPI Main Application
 RESTful API for BESS Analytics Platform.
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from contextlib import asynccontextmanager
 
-from src.api.routes import router
+from src.api.routes import router, shutdown_cpu_pool
 from src.utils.config import get_settings
 from src.utils.logger import get_logger
 
@@ -23,6 +24,7 @@ async def lifespan(app: FastAPI):
     logger.info("Starting BESS Analytics Platform...")
     yield
     logger.info("Shutting down BESS Analytics Platform...")
+    shutdown_cpu_pool()
 
 
 # Create FastAPI application
@@ -30,7 +32,8 @@ app = FastAPI(
     title="BESS Analytics Platform",
     description="Battery Energy Storage System Analytics API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -42,6 +45,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Reject oversized uploads from Content-Length, before the form is parsed."""
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        max_bytes = get_settings().max_upload_mb << 20
+        try:
+            content_length = int(request.headers.get("content-length", ""))
+        except ValueError:
+            content_length = None
+
+        if content_length is not None and content_length > max_bytes:
+            return ORJSONResponse(
+                status_code=413,
+                content={"detail": f"Upload exceeds {max_bytes >> 20} MB limit"}
+            )
+
+    return await call_next(request)
+
+
 # Include routers
 app.include_router(router, prefix="/api/v1")
 
@@ -2,11 +2,29 @@
 Pydantic models for API request/response validation.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
 
+class BatteryRecord(BaseModel):
+    """Single battery telemetry sample."""
+    model_config = ConfigDict(extra='allow')
+
+    timestamp: datetime
+    # Required keys, but a sensor may report no reading (null)
+    voltage: Optional[float]
+    current: Optional[float]
+    temperature: Optional[float]
+    soc: Optional[float] = None
+    capacity: Optional[float] = None
+    power: Optional[float] = None
+
+
+# Validates/dumps whole record lists in one call into the Rust core
+BatteryRecordList = TypeAdapter(List[BatteryRecord])
+
+
 class BatteryMetricsResponse(BaseModel):
     """Response model for battery metrics."""
     battery_id: str
@@ -23,8 +41,10 @@ class BatteryMetricsResponse(BaseModel):
 
 class ProcessDataRequest(BaseModel):
     """Request model for data processing."""
+    model_config = ConfigDict(extra='forbid')
+
     battery_id: str
-    data: List[Dict[str, Any]]
+    data: List[BatteryRecord]
     clean: bool = True
     add_features: bool = True
 
@@ -39,9 +59,11 @@ class ProcessDataResponse(BaseModel):
 
 class AnomalyDetectionRequest(BaseModel):
     """Request model for anomaly detection."""
+    model_config = ConfigDict(extra='forbid')
+
     battery_id: str
-    data: List[Dict[str, Any]]
-    contamination: float = Field(default=0.05, ge=0.0, le=0.5)
+    data: List[BatteryRecord] = Field(..., min_length=1)
+    contamination: float = Field(default=0.05, gt=0.0, le=0.5)
     thresholds: Optional[Dict[str, tuple]] = None
 
 
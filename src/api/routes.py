@@ -2,25 +2,211 @@
 API Routes for BESS Analytics Platform
 """
 
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from cachetools import TTLCache, cached
 from typing import List, Optional
 import pandas as pd
-from io import StringIO
+import numpy as np
+import pyarrow as pa
 
 from src.api.models import (
     BatteryMetricsResponse,
     AnomalyDetectionRequest,
     AnomalyDetectionResponse,
+    BatteryRecord,
+    BatteryRecordList,
     ProcessDataRequest,
     ProcessDataResponse
 )
 from src.analytics.battery_metrics import BatteryMetricsCalculator
 from src.analytics.data_processor import BatteryDataProcessor
 from src.analytics.anomaly_detector import BatteryAnomalyDetector
-from src.utils.logger import get_logger
+from src.data.data_loader import load_battery_data
+from src.utils.config import get_settings
 
 router = APIRouter()
-logger = get_logger(__name__)
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+@lru_cache(maxsize=1)
+def _get_processor() -> BatteryDataProcessor:
+    """Get shared data processor instance."""
+    return BatteryDataProcessor()
+
+
+@lru_cache(maxsize=1)
+def _get_calculator() -> BatteryMetricsCalculator:
+    """Get shared metrics calculator instance."""
+    return BatteryMetricsCalculator()
+
+
+@lru_cache(maxsize=16)
+def _get_detector(contamination: float) -> BatteryAnomalyDetector:
+    """
+    Get shared anomaly detector for a contamination level.
+
+    Keyed on the exact value so the model always uses the requested
+    contamination; the LRU bound keeps the number of instances small.
+
+    Detectors run inside the process pool, which already uses one worker
+    per core, so each one fits single-threaded.
+    """
+    return BatteryAnomalyDetector(contamination=contamination, n_jobs=1)
+
+
+_cpu_pool: Optional[ProcessPoolExecutor] = None
+_cpu_pool_lock = threading.Lock()
+
+
+def _get_cpu_pool() -> ProcessPoolExecutor:
+    """Get the process pool for CPU-bound work, creating it on first use."""
+    global _cpu_pool
+    with _cpu_pool_lock:
+        if _cpu_pool is None:
+            # Spawn rather than fork: the server process runs threads
+            _cpu_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _cpu_pool
+
+
+def _discard_cpu_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next submission starts a fresh one."""
+    global _cpu_pool
+    with _cpu_pool_lock:
+        if _cpu_pool is pool:
+            _cpu_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run_in_cpu_pool(func, *args):
+    """
+    Run a function in the process pool, replacing the pool if it broke.
+
+    A worker dying (e.g. OOM-killed) leaves the executor permanently
+    broken; the call is retried once on a fresh pool.
+
+    Args:
+        func: Picklable module-level function
+        *args: Arguments for func
+
+    Returns:
+        Result of func
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = _get_cpu_pool()
+        try:
+            return await loop.run_in_executor(pool, func, *args)
+        except BrokenProcessPool:
+            _discard_cpu_pool(pool)
+            if attempt:
+                raise
+
+
+def shutdown_cpu_pool():
+    """Shut down the process pool if it was started."""
+    global _cpu_pool
+    with _cpu_pool_lock:
+        if _cpu_pool is not None:
+            _cpu_pool.shutdown(wait=True, cancel_futures=True)
+            _cpu_pool = None
+
+
+def _run_detection(records: List[dict], contamination: float) -> dict:
+    """
+    Run comprehensive anomaly detection (executes in a pool worker).
+
+    Args:
+        records: Battery records as plain dicts
+        contamination: Expected proportion of anomalies
+
+    Returns:
+        Anomaly summary and the first 10 anomalous records
+    """
+    # Columnar build via Arrow (keys inferred across all records, record
+    # fields kept in model order); pandas handles values Arrow cannot type
+    try:
+        table = pa.Table.from_struct_array(pa.array(records))
+        fields = [name for name in BatteryRecord.model_fields if name in table.column_names]
+        extra = [name for name in table.column_names if name not in BatteryRecord.model_fields]
+        df = table.select(fields + extra).to_pandas(coerce_temporal_nanoseconds=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = pd.DataFrame(records)
+
+    # Detectors are cached per worker process
+    detector = _get_detector(contamination)
+    detector.reset()
+    results = detector.comprehensive_anomaly_detection(df, copy=False)
+
+    # One pass over is_anomaly feeds both the summary and the top-10 slice
+    mask = results['is_anomaly'].to_numpy() if 'is_anomaly' in results.columns else None
+    summary = detector.get_anomaly_summary(results, mask=mask)
+
+    # Extract the first 10 anomalies without materializing the rest
+    if mask is not None:
+        anomalies = results.iloc[np.flatnonzero(mask)[:10]].to_dict('records')
+    else:
+        anomalies = []
+
+    return {
+        'summary': summary,
+        'anomalies': anomalies
+    }
+
+
+def _upload_too_large(max_bytes: int) -> HTTPException:
+    """Build the 413 error for an upload over the size limit."""
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload exceeds {max_bytes // (1 << 20)} MB limit"
+    )
+
+
+async def _spool_upload(file: UploadFile, max_bytes: int) -> str:
+    """
+    Stream an upload to a temporary CSV file in fixed-size chunks.
+
+    Requests with a Content-Length are size-checked by middleware before
+    the form is parsed; the file size check here covers chunked uploads.
+
+    Args:
+        file: Uploaded file
+        max_bytes: Maximum accepted upload size
+
+    Returns:
+        Path of the temporary file (the caller deletes it)
+
+    Raises:
+        HTTPException: 413 if the upload exceeds max_bytes
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _upload_too_large(max_bytes)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp:
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                tmp.write(chunk)
+        except BaseException:
+            # The caller never sees the path, so clean up here
+            # (e.g. client disconnect or cancellation mid-upload)
+            os.unlink(tmp.name)
+            raise
+
+    return tmp.name
 
 
 @router.post("/process", response_model=ProcessDataResponse)
@@ -34,17 +220,21 @@ async def process_battery_data(file: UploadFile = File(...)):
     Returns:
         Processed data summary
     """
+    tmp_path = None
     try:
-        # Read CSV
-        contents = await file.read()
-        df = pd.read_csv(StringIO(contents.decode('utf-8')))
+        # Spool to disk and parse from the path rather than an in-memory copy
+        max_bytes = get_settings().max_upload_mb << 20
+        tmp_path = await _spool_upload(file, max_bytes)
+
+        # Reject uploads missing required columns before the full parse
+        processor = _get_processor()
+        df = load_battery_data(tmp_path, required_columns=processor.REQUIRED_COLUMNS)
 
         # Process data
-        processor = BatteryDataProcessor()
         processed_df = processor.process_pipeline(df)
 
         # Calculate metrics
-        calculator = BatteryMetricsCalculator()
+        calculator = _get_calculator()
         metrics = calculator.calculate_comprehensive_metrics(processed_df)
 
         return ProcessDataResponse(
@@ -54,10 +244,55 @@ async def process_battery_data(file: UploadFile = File(...)):
             message="Data processed successfully"
         )
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error(f"Error processing data: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
+    finally:
+        if tmp_path is not None:
+            os.unlink(tmp_path)
+
+
+# In production, this would query from database
+# For demo, serve sample metrics
+_SAMPLE_METRICS_TEMPLATE = {
+    "timestamp": "2025-11-22T08:00:00Z",
+    "soh": 94.5,
+    "current_soc": 78.3,
+    "avg_voltage": 52.4,
+    "avg_current": 12.5,
+    "avg_temperature": 28.7,
+    "full_cycles": 1245,
+    "degradation_rate": 0.12,
+    "health_status": "good"
+}
+
+_metrics_cache = TTLCache(maxsize=4096, ttl=60)
+_metrics_lock = threading.RLock()
+
+
+@cached(_metrics_cache, lock=_metrics_lock)
+def _compute_metrics(
+    battery_id: str,
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> dict:
+    """
+    Build the metrics payload for a battery, cached for 60 seconds.
+
+    Args:
+        battery_id: Battery identifier
+        start_date: Start date for metrics (ISO format)
+        end_date: End date for metrics (ISO format)
+
+    Returns:
+        Metrics payload
+    """
+    return {"battery_id": battery_id} | _SAMPLE_METRICS_TEMPLATE
+
 
 @router.get("/metrics/{battery_id}", response_model=BatteryMetricsResponse)
 async def get_battery_metrics(
@@ -77,24 +312,7 @@ async def get_battery_metrics(
         Battery metrics and health status
     """
     try:
-        # In production, this would query from database
-        # For demo, return sample metrics
-        calculator = BatteryMetricsCalculator()
-
-        sample_metrics = {
-            "battery_id": battery_id,
-            "timestamp": "2025-11-22T08:00:00Z",
-            "soh": 94.5,
-            "current_soc": 78.3,
-            "avg_voltage": 52.4,
-            "avg_current": 12.5,
-            "avg_temperature": 28.7,
-            "full_cycles": 1245,
-            "degradation_rate": 0.12,
-            "health_status": "good"
-        }
-
-        return BatteryMetricsResponse(**sample_metrics)
+        return BatteryMetricsResponse(**_compute_metrics(battery_id, start_date, end_date))
 
     except Exception as e:
         logger.error(f"Error fetching metrics: {str(e)}")
@@ -113,27 +331,18 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
         Anomaly detection results
     """
     try:
-        # Convert request data to DataFrame
-        df = pd.DataFrame(request.data)
-
-        # Run anomaly detection
-        detector = BatteryAnomalyDetector(contamination=request.contamination)
-        results = detector.comprehensive_anomaly_detection(df)
-
-        # Get summary
-        summary = detector.get_anomaly_summary(results)
+        # Bulk dump to plain dicts (unset optionals dropped) for the worker
+        records = BatteryRecordList.dump_python(request.data, exclude_unset=True)
 
-        # Extract anomalies
-        if 'is_anomaly' in results.columns:
-            anomalies = results[results['is_anomaly']].to_dict('records')
-        else:
-            anomalies = []
+        # Run anomaly detection off the event loop, in a worker process
+        result = await _run_in_cpu_pool(_run_detection, records, request.contamination)
+        summary = result['summary']
 
         return AnomalyDetectionResponse(
             battery_id=request.battery_id,
             anomaly_count=summary['anomaly_count'],
             anomaly_percentage=summary['anomaly_percentage'],
-            anomalies=anomalies[:10],  # Return top 10
+            anomalies=result['anomalies'],
             summary=summary
         )
 
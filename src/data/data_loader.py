@@ -1,19 +1,64 @@
 """Data loading utilities."""
 
 import pandas as pd
-from typing import Union, Optional
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from typing import Iterable, Union, Optional
 from pathlib import Path
 
 
-def load_battery_data(source: Union[str, Path]) -> pd.DataFrame:
+def _check_columns(stream: pa.NativeFile, required_columns: Iterable[str]):
+    """
+    Check a CSV header for required columns by reading only its first block.
+
+    Args:
+        stream: Arrow stream positioned at the start of the CSV
+        required_columns: Column names that must be present
+
+    Raises:
+        ValueError: If any required column is missing
+    """
+    reader = pacsv.open_csv(stream, read_options=pacsv.ReadOptions(block_size=64 << 10))
+    names = set(reader.schema.names)
+    missing = [col for col in required_columns if col not in names]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+
+def load_battery_data(
+    source: Union[str, Path],
+    required_columns: Optional[Iterable[str]] = None
+) -> pd.DataFrame:
     """
     Load battery data from CSV file.
 
+    Parsing is done by Arrow's multithreaded CSV reader, which also
+    converts ISO-8601 timestamps while tokenizing.
+
     Args:
         source: Path to CSV file
+        required_columns: Columns to check for before the full parse (optional)
 
     Returns:
         DataFrame with battery data
     """
-    df = pd.read_csv(source, parse_dates=['timestamp'])
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+
+    # Memory-map the file so the reader works off the page cache directly
+    with pa.memory_map(str(source), 'r') as mapped:
+        if required_columns is not None:
+            _check_columns(mapped, required_columns)
+            mapped.seek(0)
+        table = pacsv.read_csv(mapped, read_options=read_options)
+
+    df = table.to_pandas(
+        split_blocks=True,
+        self_destruct=True,
+        coerce_temporal_nanoseconds=True
+    )
+
+    # Timestamps in non-ISO formats come through as strings
+    if 'timestamp' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+
     return df
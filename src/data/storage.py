@@ -1,24 +1,47 @@
 """Data storage utilities."""
 
 import pandas as pd
-from typing import Optional
+from typing import ClassVar, Optional, Set
 from pathlib import Path
 
+from src.data.data_loader import load_battery_data
+
 
 class DataStorage:
     """Handle data persistence."""
 
+    # Directories already created in this process (absolute paths)
+    _ensured_dirs: ClassVar[Set[Path]] = set()
+
     def __init__(self, base_path: str = "data"):
         self.base_path = Path(base_path)
-        self.base_path.mkdir(exist_ok=True)
+        self._ensure_dir(self.base_path)
+
+    def _ensure_dir(self, path: Path):
+        """Create a directory once per process, skipping the syscall after."""
+        path = path.absolute()
+        if path not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
 
     def save_processed_data(self, data: pd.DataFrame, filename: str):
         """Save processed data to CSV."""
         filepath = self.base_path / "processed" / filename
-        filepath.parent.mkdir(exist_ok=True)
+        self._ensure_dir(filepath.parent)
         data.to_csv(filepath, index=False)
 
     def load_processed_data(self, filename: str) -> pd.DataFrame:
         """Load processed data from CSV."""
         filepath = self.base_path / "processed" / filename
-        return pd.read_csv(filepath, parse_dates=['timestamp'])
+        return load_battery_data(filepath)
+
+    def save_processed_data_parquet(self, data: pd.DataFrame, filename: str):
+        """Save processed data to Parquet (snappy), keeping dtypes intact."""
+        filepath = self.base_path / "processed" / filename
+        self._ensure_dir(filepath.parent)
+        data.to_parquet(filepath, compression='snappy', index=False)
+
+    def load_processed_data_parquet(self, filename: str) -> pd.DataFrame:
+        """Load processed data from Parquet."""
+        filepath = self.base_path / "processed" / filename
+        return pd.read_parquet(filepath)
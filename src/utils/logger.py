@@ -3,9 +3,51 @@ Structured logging configuration.
 """
 
 import logging
-import sys
+import logging.config
+import threading
 from typing import Optional
 
+_configured = False
+_configure_lock = threading.Lock()
+
+LOGGING_CONFIG = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'default': {
+            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            'datefmt': '%Y-%m-%d %H:%M:%S'
+        }
+    },
+    'handlers': {
+        'stdout': {
+            'class': 'logging.StreamHandler',
+            'stream': 'ext://sys.stdout',
+            'formatter': 'default',
+            'level': 'INFO'
+        }
+    },
+    'loggers': {
+        # Every application module logs under the 'src' package logger
+        'src': {
+            'handlers': ['stdout'],
+            'level': 'INFO'
+        }
+    }
+}
+
+
+def _configure_logging():
+    """Apply the logging configuration once per process."""
+    global _configured
+    with _configure_lock:
+        if not _configured:
+            logging.config.dictConfig(LOGGING_CONFIG)
+            _configured = True
+
+
+_configure_logging()
+
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
@@ -17,21 +59,4 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
     Returns:
         Configured logger
     """
-    logger = logging.getLogger(name or __name__)
-
-    if not logger.handlers:
-        # Configure handler
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(logging.INFO)
-
-        # Format
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        handler.setFormatter(formatter)
-
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
-
-    return logger
+    return logging.getLogger(name or __name__)
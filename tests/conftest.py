@@ -0,0 +1,12 @@
+"""Shared test fixtures."""
+
+import pytest
+from fastapi.testclient import TestClient
+from src.api.main import app
+
+
+@pytest.fixture(scope='session')
+def client():
+    """API test client; runs the app lifespan once for the session."""
+    with TestClient(app) as c:
+        yield c
@@ -0,0 +1,129 @@
+"""Tests for anomaly detector."""
+
+import warnings
+
+import pytest
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from src.analytics.anomaly_detector import BatteryAnomalyDetector, _rolling_mean_std
+
+
+def test_detect_statistical_anomalies():
+    """Test z-score anomaly detection."""
+    detector = BatteryAnomalyDetector()
+
+    data = pd.DataFrame({
+        'voltage': [48.0] * 49 + [80.0],
+        'temperature': np.linspace(20, 30, 50)
+    })
+
+    result = detector.detect_statistical_anomalies(data)
+
+    expected = np.abs((data['voltage'] - data['voltage'].mean()) / data['voltage'].std())
+    np.testing.assert_allclose(result['voltage_zscore'], expected)
+    assert result['voltage_anomaly'].iloc[-1]
+    assert not result['temperature_anomaly'].any()
+    assert result['is_anomaly'].sum() == 1
+
+
+def test_comprehensive_anomaly_detection():
+    """Test full anomaly detection pipeline."""
+    detector = BatteryAnomalyDetector()
+
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=100, freq='1min'),
+        'voltage': np.random.uniform(45, 52, 100),
+        'current': np.random.uniform(-10, 10, 100),
+        'temperature': np.random.uniform(20, 30, 100)
+    })
+
+    results = detector.comprehensive_anomaly_detection(data)
+
+    assert len(results) == len(data)
+    assert 'anomaly_score' in results.columns
+    assert results['isolation_forest_anomaly'].dtype == bool
+    # Isolation Forest sees only the raw telemetry, not derived indicators
+    assert detector.isolation_forest.n_features_in_ == 3
+
+
+def test_rolling_mean_std():
+    """Test rolling mean/std against pandas and an exact two-pass std."""
+    rng = np.random.default_rng(0)
+    data = np.column_stack([
+        rng.normal(48, 2, 5000),
+        np.cumsum(np.abs(rng.normal(size=5000)))
+    ])
+    data[100, 0] = np.nan
+
+    mean, std = _rolling_mean_std(data, 20)
+
+    expected = pd.DataFrame(data).rolling(20)
+    np.testing.assert_allclose(mean, expected.mean().to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(std, expected.std().to_numpy(), rtol=1e-6)
+
+    # Long monotone drift: no error build-up across the series
+    drift = np.linspace(0, 1e4, 1_000_000)
+    _, std = _rolling_mean_std(drift, 20)
+    exact = sliding_window_view(drift, 20).std(axis=1, ddof=1)
+    assert np.isnan(std[:19]).all()
+    np.testing.assert_allclose(std[19:], exact, rtol=1e-8)
+
+
+def test_anomaly_summary_independent_of_detector_state():
+    """Test a fresh detector summarizes results like the one that produced them."""
+    detector = BatteryAnomalyDetector()
+
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=100, freq='1min'),
+        'voltage': np.random.uniform(45, 52, 100),
+        'current': np.random.uniform(-10, 10, 100),
+        'temperature': np.random.uniform(20, 30, 100)
+    })
+
+    results = detector.comprehensive_anomaly_detection(data)
+
+    summary = detector.get_anomaly_summary(results)
+    assert summary == BatteryAnomalyDetector().get_anomaly_summary(results)
+    assert 'anomaly_score' not in summary['anomaly_types']
+
+
+def test_detect_statistical_anomalies_sparse_columns():
+    """Test empty and constant columns yield no flags and no warnings."""
+    detector = BatteryAnomalyDetector()
+
+    data = pd.DataFrame({
+        'voltage': [48.0] * 10,
+        'current': [np.nan] * 9 + [1.0],
+        'temperature': np.linspace(20, 30, 10)
+    })
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        result = detector.detect_statistical_anomalies(data)
+
+    assert result['voltage_zscore'].isna().all()
+    assert result['current_zscore'].isna().all()
+    assert not result['is_anomaly'].any()
+
+
+def test_anomaly_summary_ignores_detector_history():
+    """Test summaries and violation flags depend only on the input frame."""
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=100, freq='1min'),
+        'voltage': np.random.uniform(45, 52, 100),
+        'current': np.random.uniform(-10, 10, 100),
+        'temperature': np.random.uniform(20, 30, 100)
+    })
+    results = BatteryAnomalyDetector().comprehensive_anomaly_detection(data)
+
+    detector = BatteryAnomalyDetector()
+    detector.detect_statistical_anomalies(data, columns=['voltage'])
+    summary = detector.get_anomaly_summary(results)
+    assert summary == BatteryAnomalyDetector().get_anomaly_summary(results)
+    assert 'temperature_anomaly' in summary['anomaly_types']
+
+    # has_violation covers violation columns already in the frame
+    flagged = data.assign(soc_violation=[True] + [False] * 99)
+    checked = detector.detect_threshold_violations(flagged, {'voltage': (0.0, 100.0)})
+    assert checked['has_violation'].iloc[0]
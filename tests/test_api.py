@@ -1,27 +1,25 @@
 """Tests for API endpoints."""
 
 import pytest
-from fastapi.testclient import TestClient
-from src.api.main import app
+import pandas as pd
+import numpy as np
 
-client = TestClient(app)
 
-
-def test_root_endpoint():
+def test_root_endpoint(client):
     """Test root endpoint."""
     response = client.get("/")
     assert response.status_code == 200
     assert "BESS Analytics Platform" in response.json()["message"]
 
 
-def test_health_check():
+def test_health_check(client):
     """Test health check endpoint."""
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
 
 
-def test_system_status():
+def test_system_status(client):
     """Test system status endpoint."""
     response = client.get("/api/v1/status")
     assert response.status_code == 200
@@ -30,7 +28,7 @@ def test_system_status():
     assert "features" in data
 
 
-def test_get_battery_metrics():
+def test_get_battery_metrics(client):
     """Test get battery metrics endpoint."""
     response = client.get("/api/v1/metrics/battery-001")
     assert response.status_code == 200
@@ -38,3 +36,167 @@ def test_get_battery_metrics():
     assert "battery_id" in data
     assert "soh" in data
     assert "health_status" in data
+
+
+def test_process_battery_data(client):
+    """Test CSV upload processing endpoint."""
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=50, freq='1min'),
+        'voltage': np.random.uniform(45, 52, 50),
+        'current': np.random.uniform(-10, 10, 50),
+        'temperature': np.random.uniform(20, 30, 50)
+    })
+
+    response = client.post(
+        "/api/v1/process",
+        files={"file": ("battery.csv", data.to_csv(index=False).encode(), "text/csv")}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["status"] == "success"
+    assert result["records_processed"] == 50
+
+
+def test_detect_anomalies(client):
+    """Test anomaly detection endpoint."""
+    timestamps = pd.date_range('2025-01-01', periods=60, freq='1min')
+    voltage = np.r_[np.full(59, 48.0), 80.0]
+    records = [
+        {'timestamp': ts.isoformat(), 'voltage': v, 'current': 1.0, 'temperature': 25.0}
+        for ts, v in zip(timestamps, voltage)
+    ]
+
+    response = client.post(
+        "/api/v1/anomalies/detect",
+        json={"battery_id": "battery-001", "data": records}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["anomaly_count"] >= 1
+    assert result["anomalies"][0]["voltage"] == 80.0
+
+
+def test_process_battery_data_missing_columns(client):
+    """Test CSV upload without required columns is rejected."""
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=10, freq='1min'),
+        'voltage': np.random.uniform(45, 52, 10)
+    })
+
+    response = client.post(
+        "/api/v1/process",
+        files={"file": ("battery.csv", data.to_csv(index=False).encode(), "text/csv")}
+    )
+    assert response.status_code == 400
+    assert "current" in response.json()["detail"]
+
+
+def test_process_battery_data_too_large(client, monkeypatch):
+    """Test uploads over the size limit are rejected with 413."""
+    from src.api import main
+    from src.utils.config import Settings
+
+    monkeypatch.setattr(main, "get_settings", lambda: Settings(max_upload_mb=0))
+
+    response = client.post(
+        "/api/v1/process",
+        files={"file": ("battery.csv", b"timestamp,voltage\n", "text/csv")}
+    )
+    assert response.status_code == 413
+
+
+def test_process_battery_data_integer_columns(client):
+    """Test uploads with integer-valued columns serialize cleanly."""
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=20, freq='1min'),
+        'voltage': np.full(20, 48),
+        'current': np.arange(20) - 10,
+        'temperature': np.full(20, 25),
+        'capacity': np.full(20, 99),
+        'soc': np.linspace(80, 61, 20).astype(int)
+    })
+
+    response = client.post(
+        "/api/v1/process",
+        files={"file": ("battery.csv", data.to_csv(index=False).encode(), "text/csv")}
+    )
+    assert response.status_code == 200
+    metrics = response.json()["metrics"]
+    assert metrics["current_soc"] == 61.0
+    assert metrics["max_temperature"] == 25.0
+
+
+def test_detect_anomalies_empty_data(client):
+    """Test anomaly detection rejects an empty record list."""
+    response = client.post(
+        "/api/v1/anomalies/detect",
+        json={"battery_id": "battery-001", "data": []}
+    )
+    assert response.status_code == 422
+
+
+def test_detect_anomalies_null_reading(client):
+    """Test anomaly detection accepts records with missing sensor readings."""
+    timestamps = pd.date_range('2025-01-01', periods=60, freq='1min')
+    records = [
+        {'timestamp': ts.isoformat(), 'voltage': 48.0, 'current': 1.0, 'temperature': 25.0}
+        for ts in timestamps
+    ]
+    records[5]['temperature'] = None
+
+    response = client.post(
+        "/api/v1/anomalies/detect",
+        json={"battery_id": "battery-001", "data": records}
+    )
+    assert response.status_code == 200
+    assert response.json()["summary"]["total_records"] == 60
+
+    # The key itself is still required
+    del records[5]['temperature']
+    response = client.post(
+        "/api/v1/anomalies/detect",
+        json={"battery_id": "battery-001", "data": records}
+    )
+    assert response.status_code == 422
+
+
+def test_detect_anomalies_contamination(client):
+    """Test small contamination values are used as given, and 0 is rejected."""
+    timestamps = pd.date_range('2025-01-01', periods=60, freq='1min')
+    records = [
+        {'timestamp': ts.isoformat(), 'voltage': 48.0 + i % 3, 'current': 1.0, 'temperature': 25.0}
+        for i, ts in enumerate(timestamps)
+    ]
+
+    response = client.post(
+        "/api/v1/anomalies/detect",
+        json={"battery_id": "battery-001", "data": records, "contamination": 0.0001}
+    )
+    assert response.status_code == 200
+
+    response = client.post(
+        "/api/v1/anomalies/detect",
+        json={"battery_id": "battery-001", "data": records, "contamination": 0.0}
+    )
+    assert response.status_code == 422
+
+
+def test_detect_anomalies_recovers_from_dead_worker(client):
+    """Test the process pool is replaced after a worker dies."""
+    import os
+    from concurrent.futures.process import BrokenProcessPool
+    from src.api import routes
+
+    with pytest.raises(BrokenProcessPool):
+        routes._get_cpu_pool().submit(os._exit, 1).result()
+
+    timestamps = pd.date_range('2025-01-01', periods=60, freq='1min')
+    records = [
+        {'timestamp': ts.isoformat(), 'voltage': 48.0, 'current': 1.0, 'temperature': 25.0}
+        for ts in timestamps
+    ]
+    response = client.post(
+        "/api/v1/anomalies/detect",
+        json={"battery_id": "battery-001", "data": records}
+    )
+    assert response.status_code == 200
@@ -61,6 +61,65 @@ def test_assess_health_status():
     assert status == "critical"
 
 
+def test_vectorized_metrics():
+    """Test array versions of SOH, SOC and health status."""
+    calculator = BatteryMetricsCalculator(nominal_capacity=100.0)
+
+    soh = calculator.calculate_soh_array(np.array([95.0, 0.0, 120.0]))
+    np.testing.assert_array_equal(soh, [95.0, 0.0, 100.0])
+
+    soc = calculator.calculate_soc_array(np.array([50.0, 150.0]), 100.0)
+    np.testing.assert_array_equal(soc, [50.0, 100.0])
+
+    status = calculator.assess_health_status_array(
+        np.array([96, 96, 90, 75, 60, 45]),
+        np.array([25, 40, 25, 25, 25, 25])
+    )
+    assert status.tolist() == ["excellent", "fair", "good", "fair", "poor", "critical"]
+
+
+def test_count_cycles():
+    """Test equivalent full cycle counting."""
+    calculator = BatteryMetricsCalculator()
+
+    # Two full 0-100-0 swings
+    data = pd.DataFrame({'soc': [0.0, 50.0, 100.0, 0.0, 100.0, 100.0, 0.0]})
+    full_cycles, partial = calculator.count_cycles(data)
+    assert full_cycles == 2
+    assert partial == pytest.approx(0.0)
+
+    # One full swing with an embedded 20% cycle adds 0.2 equivalent cycles
+    data = pd.DataFrame({'soc': [0.0, 100.0, 40.0, 60.0, 0.0]})
+    full_cycles, partial = calculator.count_cycles(data)
+    assert full_cycles == 1
+    assert partial == pytest.approx(0.2)
+
+    assert calculator.count_cycles(pd.DataFrame({'voltage': [48.0]})) == (0, 0.0)
+
+
+def test_count_rainflow_cycles():
+    """Test raw rainflow counting ignores sensor noise."""
+    calculator = BatteryMetricsCalculator()
+
+    # Embedded 20% cycle is a closed cycle of its own; the outer swing
+    # stays open as two half cycles
+    data = pd.DataFrame({'soc': [0.0, 100.0, 40.0, 60.0, 0.0]})
+    assert calculator.count_rainflow_cycles(data) == (1, 2)
+    assert calculator.count_rainflow_cycles(data, min_depth=30.0) == (0, 2)
+
+    # Five 10-90 % cycles with N(0, 0.2 %) sensor noise
+    rng = np.random.default_rng(0)
+    soc = 50 - 40 * np.cos(np.linspace(0, 10 * np.pi, 10_000))
+    noisy = pd.DataFrame({'soc': soc + rng.normal(0, 0.2, soc.size)})
+    closed, halves = calculator.count_rainflow_cycles(noisy)
+    assert closed + halves / 2 == 5
+    full_cycles, partial = calculator.count_cycles(noisy)
+    assert full_cycles + partial == pytest.approx(4.0, abs=0.05)
+
+    # Without filtering, jitter is counted as cycles
+    assert calculator.count_rainflow_cycles(noisy, min_depth=0.0)[0] > 1000
+
+
 def test_comprehensive_metrics():
     """Test comprehensive metrics calculation."""
     calculator = BatteryMetricsCalculator()
@@ -74,3 +74,42 @@ def test_process_pipeline():
 
     assert len(processed) > 0
     assert 'power' in processed.columns
+    # Pipeline input is not retained on the (shareable) processor
+    assert processor.data is None
+    assert 'power' not in data.columns
+
+
+def test_load_data_from_csv(tmp_path):
+    """Test loading data from a CSV file."""
+    processor = BatteryDataProcessor()
+
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=10, freq='1min'),
+        'voltage': np.random.uniform(45, 52, 10),
+        'current': np.random.uniform(-10, 10, 10),
+        'temperature': np.random.uniform(20, 30, 10)
+    })
+    path = tmp_path / 'battery.csv'
+    data.to_csv(path, index=False)
+
+    loaded = processor.load_data(str(path))
+
+    assert pd.api.types.is_datetime64_any_dtype(loaded['timestamp'])
+    pd.testing.assert_frame_equal(loaded, data, check_freq=False)
+
+
+def test_resample_data():
+    """Test resampling matches pandas resample."""
+    processor = BatteryDataProcessor()
+
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01 00:00:30', periods=100, freq='37s'),
+        'voltage': np.random.uniform(45, 52, 100),
+        'current': np.random.uniform(-10, 10, 100)
+    })
+    data.loc[3, 'voltage'] = np.nan
+
+    resampled = processor.resample_data(data, '5min')
+
+    expected = data.set_index('timestamp').resample('5min').mean().reset_index()
+    pd.testing.assert_frame_equal(resampled, expected, check_freq=False)
@@ -0,0 +1,47 @@
+"""Tests for data storage."""
+
+import pytest
+import pandas as pd
+import numpy as np
+from src.data.storage import DataStorage
+
+
+def test_parquet_roundtrip(tmp_path):
+    """Test Parquet save/load keeps values and dtypes."""
+    storage = DataStorage(base_path=str(tmp_path))
+
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=50, freq='1min'),
+        'voltage': np.random.uniform(45, 52, 50),
+        'current': np.random.uniform(-10, 10, 50),
+        'temperature': np.random.uniform(20, 30, 50)
+    })
+
+    storage.save_processed_data_parquet(data, 'battery.parquet')
+    loaded = storage.load_processed_data_parquet('battery.parquet')
+
+    pd.testing.assert_frame_equal(loaded, data)
+
+
+def test_csv_roundtrip(tmp_path):
+    """Test CSV save/load parses timestamps back."""
+    storage = DataStorage(base_path=str(tmp_path))
+
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=50, freq='1min'),
+        'voltage': np.random.uniform(45, 52, 50),
+        'current': np.zeros(50)
+    })
+
+    storage.save_processed_data(data, 'battery.csv')
+    loaded = storage.load_processed_data('battery.csv')
+
+    assert pd.api.types.is_datetime64_any_dtype(loaded['timestamp'])
+    np.testing.assert_allclose(loaded['voltage'], data['voltage'])
+    # Whole-number floats stay floats
+    assert loaded['current'].dtype == np.float64
+
+    # Columns without a columnar CSV representation still save
+    data['readings'] = [[1, 2]] * 50
+    storage.save_processed_data(data, 'nested.csv')
+    assert (tmp_path / 'processed' / 'nested.csv').stat().st_size > 0